@@ -1,9 +1,17 @@
+from functools import cached_property
+
 from crawl4ai import BrowserConfig
-from pydantic import Field, computed_field
+from crawl4ai.config import PAGE_TIMEOUT
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from .types import BrowserType, CacheModeType
 
+# Extra seconds on top of crawl4ai's own page navigation timeout, to cover the delay,
+# user simulation and scraping after navigation. A slow page is then reported by
+# crawl4ai as a failed result instead of stopping the whole deep crawl
+_PAGE_TIMEOUT_MARGIN = 60.0
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(validate_default=False, env_prefix="C4AI_")
@@ -37,10 +45,40 @@ class Settings(BaseSettings):
         default=50,
         description="Maximum number of pages to crawl in deep crawling strategies",
     )
+    page_timeout: float = Field(
+        default=PAGE_TIMEOUT / 1000 + _PAGE_TIMEOUT_MARGIN,
+        description="Maximum seconds to wait for the next page in deep crawling strategies",
+    )
     include_external: bool = Field(
         default=False,
         description="Whether to include content from external links in deep crawling strategies",
     )
+    max_concurrent_hosts: int = Field(
+        default=5,
+        description="Maximum number of hosts crawled concurrently when crawling multiple URLs",
+    )
+    domain_delay: float = Field(
+        default=1.0,
+        description="Minimum delay in seconds between batches of requests to the same host",
+    )
+    result_cache_size: int = Field(
+        default=1024,
+        description="Maximum number of crawl results kept in the in-process result cache",
+    )
+    result_cache_ttl: float = Field(
+        default=300.0,
+        description=(
+            "Seconds a crawl result stays in the in-process result cache. "
+            "The cache is not used when cache_mode is bypass."
+        ),
+    )
+    http_fast_path: bool = Field(
+        default=False,
+        description=(
+            "Fetch pages over plain HTTP first when crawling multiple URLs, and only use "
+            "the browser for pages that appear to need JavaScript"
+        ),
+    )
     content_type: str = Field(
         default="markdown",
         description=(
@@ -49,10 +87,9 @@ class Settings(BaseSettings):
         ),
     )
 
-    @computed_field  # type: ignore[prop-decorator]
-    @property
+    @cached_property
     def browser_config(self) -> BrowserConfig:
-        """Generate BrowserConfig based on the current settings."""
+        """Generate BrowserConfig based on the settings, built once on first access."""
         return BrowserConfig(
             browser_type=self.browser_type,
             headless=self.headless,
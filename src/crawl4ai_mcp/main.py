@@ -1,18 +1,35 @@
+import asyncio
+import sys
+
 import click
 
 from .types import TransportType
 
 
+def install_uvloop() -> None:
+    """Use uvloop for the asyncio event loop if it is installed."""
+    # Event loop policies are deprecated from Python 3.14 and removed in 3.16, and
+    # FastMCP.run does not take a loop factory, so uvloop is only used before 3.14
+    if sys.version_info >= (3, 14):
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 @click.command()
 @click.option(
     "--transport",
-    type=click.Choice(["stdio", "html"]),
+    type=click.Choice(["stdio", "http"]),
     default="stdio",
     help="Transport type",
 )
 def main(transport: TransportType) -> None:
     from .server import app
 
+    install_uvloop()
     if transport == "http":
         app.run(transport="streamable-http")
     else:
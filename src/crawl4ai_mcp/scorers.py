@@ -0,0 +1,49 @@
+import re
+
+from crawl4ai import KeywordRelevanceScorer
+
+
+class RegexPriorityScorer(KeywordRelevanceScorer):
+    """Score URLs by regex priority patterns, combined with keyword relevance.
+
+    Each pattern maps to a priority, where higher priorities are crawled first. A URL
+    scores the highest priority among the patterns it matches, normalized to [0, 1]
+    by the largest priority given. When keywords are also given, the result is the
+    mean of the pattern and keyword scores.
+    """
+
+    __slots__ = ("_patterns", "_max_priority", "_has_keywords")
+
+    def __init__(
+        self,
+        patterns: dict[str, int],
+        keywords: list[str] | None = None,
+        weight: float = 1.0,
+        case_sensitive: bool = False,
+    ):
+        super().__init__(
+            keywords=keywords or [], weight=weight, case_sensitive=case_sensitive
+        )
+        flags = 0 if case_sensitive else re.IGNORECASE
+        # Compile patterns once, since every discovered link is scored
+        self._patterns = [
+            (re.compile(pattern, flags), priority)
+            for pattern, priority in patterns.items()
+        ]
+        self._max_priority = max(patterns.values(), default=0)
+        self._has_keywords = bool(keywords)
+
+    def _pattern_score(self, url: str) -> float:
+        if self._max_priority <= 0:
+            return 0.0
+        priority = max(
+            (prio for pattern, prio in self._patterns if pattern.search(url)),
+            default=0,
+        )
+        return max(priority, 0) / self._max_priority
+
+    def _calculate_score(self, url: str) -> float:
+        pattern_score = self._pattern_score(url)
+        if not self._has_keywords:
+            return pattern_score
+        return (pattern_score + super()._calculate_score(url)) / 2
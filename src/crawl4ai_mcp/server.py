@@ -1,9 +1,17 @@
-import io
+import asyncio
+import copy
+import re
 import sys
+import time
+from collections import defaultdict
 from collections.abc import AsyncIterator
-from contextlib import redirect_stdout
-from urllib.parse import quote
+from contextlib import AsyncExitStack, asynccontextmanager, redirect_stdout
+from functools import singledispatch
+from typing import Any
+from urllib.parse import quote, urlparse
 
+import aiohttp
+from cachetools import TTLCache
 from crawl4ai import (
     AsyncWebCrawler,
     BestFirstCrawlingStrategy,
@@ -14,46 +22,437 @@ from crawl4ai import (
     GeolocationConfig,
     KeywordRelevanceScorer,
 )
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy
 from crawl4ai.models import CrawlResultContainer
 from crawl4ai.types import RunManyReturn
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from .config import settings
-from .types import MCPCrawlResult
+from .scorers import RegexPriorityScorer
+from .types import ErrorCodeType, MCPCrawlResult
 
+# Run configurations are built once at import, since settings are fixed for the
+# lifetime of the server. They are shared by concurrent calls: the crawler only
+# writes config.url for each page it crawls, and nothing relies on that across calls
+_CACHE_MODE = CacheMode(settings.cache_mode)
+_LA_GEO = GeolocationConfig(  # override GPS coords
+    latitude=34.0522,
+    longitude=-118.2437,
+    accuracy=10.0,
+)
+# Stealth mode settings
+_STEALTH_KW: dict[str, Any] = dict(
+    user_agent_mode="random",
+    simulate_user=True,
+    timezone_id="America/Los_Angeles",  # JS Date()/Intl timezone
+    geolocation=_LA_GEO,
+)
+# Plain HTTP fetches for the fast path skip the browser-only stealth and page options
+_HTTP_CRAWL_CFG = CrawlerRunConfig(
+    cache_mode=_CACHE_MODE,
+    word_count_threshold=settings.word_count_threshold,
+    exclude_external_links=False,
+    exclude_social_media_links=True,
+    stream=True,
+)
+# Pages fetched over plain HTTP with less html than this, or matching these markers,
+# are assumed to render their content with JavaScript
+_MIN_STATIC_HTML_SIZE = 1024
+_JS_REQUIRED_RE = re.compile(
+    r"(?:enable|requires?) javascript|<div id=\"(?:root|app|__next)\">\s*</div>",
+    re.IGNORECASE,
+)
+# Pages with more html than this are handled off the event loop
+_LARGE_PAGE_SIZE = 65536
+_GOOGLE_SEARCH_URL = "https://www.google.com/search?q="
+_GOOGLE_CFG = CrawlerRunConfig(
+    stream=True,
+    cache_mode=_CACHE_MODE,
+    keep_attrs=["id", "class"],
+    keep_data_attributes=True,
+    delay_before_return_html=2,
+    word_count_threshold=settings.word_count_threshold,
+    **_STEALTH_KW,
+)
+_CRAWL_CFG = CrawlerRunConfig(
+    cache_mode=_CACHE_MODE,
+    word_count_threshold=settings.word_count_threshold,  # Only return content with at least 10 words
+    exclude_external_links=False,
+    exclude_social_media_links=True,
+    stream=True,
+    # Content handling
+    process_iframes=True,
+    remove_overlay_elements=True,
+    magic=True,
+    **_STEALTH_KW,
+)
+# Deep crawls need a fresh strategy per call, so each call copies this template.
+# Copying is far cheaper than constructing, since CrawlerRunConfig inspects its
+# own signature on every attribute set. Like the shared configs above, the copies
+# are only written to by the crawler setting config.url
+_DEEP_BASE_CFG = CrawlerRunConfig(
+    stream=True,  # Handle results as they come in
+    cache_mode=_CACHE_MODE,
+    word_count_threshold=settings.word_count_threshold,  # Only return content with at least 10 words
+    **_STEALTH_KW,
+)
+
+
+class UnexpectedResultTypeError(TypeError):
+    """Raised when the crawler returns a result of an unexpected type."""
 
+
+def classify_error_message(message: str | None) -> ErrorCodeType:
+    """Classify an error by its message, for errors the crawler only reports as text."""
+    lowered = (message or "").lower()
+    if "timeout" in lowered or "timed out" in lowered:
+        return "timeout"
+    # Chromium network errors, e.g. net::ERR_NAME_NOT_RESOLVED
+    if "net::err_" in lowered:
+        return "network"
+    return "unknown"
+
+
+def classify_error(e: Exception) -> ErrorCodeType:
+    """Classify an exception raised while crawling into an error code."""
+    if isinstance(e, UnexpectedResultTypeError):
+        return "invalid_result_type"
+    # Checked first, since timeouts also subclass the network and browser errors
+    if isinstance(e, (TimeoutError, PlaywrightTimeoutError)):
+        return "timeout"
+    if isinstance(e, (aiohttp.ClientError, ConnectionError)):
+        return "network"
+    if isinstance(e, PlaywrightError):
+        return "browser"
+    # The crawler wraps many browser errors in generic exceptions
+    return classify_error_message(str(e))
+
+
+@singledispatch
 def handle_crawl_result(result: RunManyReturn) -> MCPCrawlResult:
-    if isinstance(result, CrawlResultContainer):
-        result = result[0]
-    if not isinstance(result, CrawlResult):
-        return MCPCrawlResult(
-            status="error",
-            error_message=f"Unexpected result type from crawler: {type(result)}",
-        )
+    """Convert a crawler result into an MCPCrawlResult, dispatching on its type."""
+    return MCPCrawlResult(
+        status="error",
+        error_message=f"Unexpected result type from crawler: {type(result)}",
+        error_code="invalid_result_type",
+    )
+
+
+@handle_crawl_result.register
+def _(result: CrawlResultContainer) -> MCPCrawlResult:
+    return handle_crawl_result(result[0])
 
-    elif result.success and settings.content_type == "html":
-        return MCPCrawlResult(status="success", url=result.url, content=result.html)
 
-    elif result.success and result.markdown:
-        # Extract the content from the result
+@handle_crawl_result.register
+def _(result: CrawlResult) -> MCPCrawlResult:
+    if not result.success:
         return MCPCrawlResult(
-            status="success",
-            url=result.url,
-            content=result.markdown.fit_markdown or result.markdown.raw_markdown,
+            status="error",
+            error_message=result.error_message or "Unknown crawl error.",
+            error_code=classify_error_message(result.error_message),
         )
+
+    # Extract the content from the result
+    if settings.content_type == "html":
+        content = result.html
+    # Each access to result.markdown builds a new copy of the raw markdown
+    elif markdown := result.markdown:
+        content = markdown.fit_markdown or markdown.raw_markdown
     else:
-        return MCPCrawlResult(
+        content = None
+
+    if content:
+        return MCPCrawlResult(status="success", url=result.url, content=content)
+    return MCPCrawlResult(
+        status="error",
+        error_message="The crawler failed to extract any valid content.",
+        error_code="no_content",
+    )
+
+
+async def handle_crawl_result_async(result: RunManyReturn) -> MCPCrawlResult:
+    """Run handle_crawl_result, in a worker thread for large pages.
+
+    Keeps the event loop free to pull the next page from the crawler while the
+    content of a large page is extracted.
+    """
+    # Size pages by their html, which unlike markdown can be read without a copy
+    if len(getattr(result, "html", None) or "") > _LARGE_PAGE_SIZE:
+        return await asyncio.to_thread(handle_crawl_result, result)
+    return handle_crawl_result(result)
+
+
+def needs_browser(result: RunManyReturn) -> bool:
+    """Guess whether a page fetched over plain HTTP needs a browser to render it."""
+    if not getattr(result, "success", False):
+        return True
+    html = getattr(result, "html", None) or ""
+    return len(html) < _MIN_STATIC_HTML_SIZE or bool(_JS_REQUIRED_RE.search(html))
+
+
+ResultCacheKey = tuple[str, str, str, int]
+ResultCache = TTLCache[ResultCacheKey, MCPCrawlResult]
+
+
+class DomainRateLimiter:
+    """Enforce a minimum delay between requests sent to the same host."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self._last_hit: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, netloc: str) -> None:
+        """Sleep until at least `delay` seconds have passed since the last request to `netloc`."""
+        async with self._lock:
+            now = time.monotonic()
+            # Forget hosts whose delay has passed, so the map only holds recent hosts
+            # instead of every host crawled over the server lifetime
+            expired = [
+                host for host, hit in self._last_hit.items() if hit + self.delay <= now
+            ]
+            for host in expired:
+                del self._last_hit[host]
+            ready_at = max(now, self._last_hit.get(netloc, -self.delay) + self.delay)
+            # Reserve the slot before sleeping so concurrent waiters queue up behind it
+            self._last_hit[netloc] = ready_at
+        if ready_at > now:
+            await asyncio.sleep(ready_at - now)
+
+
+@asynccontextmanager
+async def lifespan(app: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    """Start the crawlers shared by all tool calls for the server lifetime."""
+    async with AsyncExitStack() as stack:
+        crawler = AsyncWebCrawler(config=settings.browser_config)
+        await crawler.start()
+        stack.push_async_callback(crawler.close)
+
+        http_crawler = None
+        if settings.http_fast_path:
+            # Plain HTTP crawler with a pooled keep-alive connection, used for pages
+            # that do not need a browser
+            http_crawler = AsyncWebCrawler(
+                crawler_strategy=AsyncHTTPCrawlerStrategy(),
+                config=settings.browser_config,
+            )
+            await http_crawler.start()
+            stack.push_async_callback(http_crawler.close)
+
+        yield {
+            "crawler": crawler,
+            "http_crawler": http_crawler,
+            "rate_limiter": DomainRateLimiter(settings.domain_delay),
+            "result_cache": TTLCache(
+                maxsize=settings.result_cache_size, ttl=settings.result_cache_ttl
+            ),
+        }
+
+
+def get_crawler(ctx: Context) -> AsyncWebCrawler:
+    """Return the shared crawler from the lifespan context."""
+    return ctx.request_context.lifespan_context["crawler"]
+
+
+def get_http_crawler(ctx: Context) -> AsyncWebCrawler | None:
+    """Return the shared plain HTTP crawler, if the HTTP fast path is enabled."""
+    return ctx.request_context.lifespan_context["http_crawler"]
+
+
+def get_rate_limiter(ctx: Context) -> DomainRateLimiter:
+    """Return the shared per-host rate limiter from the lifespan context."""
+    return ctx.request_context.lifespan_context["rate_limiter"]
+
+
+def get_result_cache(ctx: Context) -> ResultCache:
+    """Return the shared crawl result cache from the lifespan context."""
+    return ctx.request_context.lifespan_context["result_cache"]
+
+
+def result_cache_key(url: str) -> ResultCacheKey:
+    """Build the result cache key for a URL under the current settings."""
+    return (
+        url,
+        settings.cache_mode,
+        settings.content_type,
+        settings.word_count_threshold,
+    )
+
+
+async def stream_deep_crawl(
+    crawler: AsyncWebCrawler, url: str, config: CrawlerRunConfig
+) -> AsyncIterator[MCPCrawlResult]:
+    """Yield a result for each page of a deep crawl as soon as it is scraped.
+
+    The crawl stops with an error result if no page arrives within the configured
+    page timeout.
+    """
+    # Pages are pulled in the calling task, since crawl4ai resets a context variable
+    # set by arun when the deep crawl generator finishes
+    try:
+        # Capture stdout from crawler and redirect to stderr to avoid conflicts
+        # with stdio transport with MCP
+        with redirect_stdout(sys.stderr):
+            pages = await crawler.arun(url, config=config)
+        if not isinstance(pages, AsyncIterator):
+            yield MCPCrawlResult(
+                status="error",
+                error_message=(
+                    f"Expected an AsyncIterator instance from arun, got: {type(pages)}"
+                ),
+                error_code="invalid_result_type",
+            )
+            return
+
+        while True:
+            deadline = asyncio.timeout(settings.page_timeout)
+            try:
+                async with deadline:
+                    page_result = await anext(pages, None)
+            except TimeoutError:
+                # Only the wait for the next page gets the page timeout message
+                if not deadline.expired():
+                    raise
+                # A single hanging page would otherwise stall the whole crawl
+                yield MCPCrawlResult(
+                    status="error",
+                    error_message=(
+                        f"Timed out after {settings.page_timeout}s waiting for the "
+                        "next page of the deep crawl"
+                    ),
+                    error_code="timeout",
+                )
+                return
+            if page_result is None:
+                return
+            yield await handle_crawl_result_async(page_result)
+    except Exception as e:
+        # Handle any exceptions that occur during crawling
+        yield MCPCrawlResult(
             status="error",
-            error_message=result.error_message or "Unknown crawl error.",
+            error_message=f"An error occurred during deep crawl: {str(e)}",
+            error_code=classify_error(e),
         )
 
 
+async def stream_crawl(
+    crawler: AsyncWebCrawler,
+    rate_limiter: DomainRateLimiter,
+    urls: list[str],
+    config: CrawlerRunConfig,
+    cache: ResultCache | None = None,
+    http_crawler: AsyncWebCrawler | None = None,
+) -> AsyncIterator[MCPCrawlResult]:
+    """Crawl URLs in per-host batches and yield each result as soon as it is scraped.
+
+    If a cache is given, cached results are yielded first without crawling, and
+    successful results of the remaining URLs are added to the cache. If an HTTP
+    crawler is given, each batch is first fetched over plain HTTP and only the pages
+    that appear to need JavaScript are crawled with the browser.
+    """
+    if cache is not None:
+        misses = []
+        for url in urls:
+            if (cached := cache.get(result_cache_key(url))) is not None:
+                yield cached
+            else:
+                misses.append(url)
+        urls = misses
+
+    semaphore = asyncio.Semaphore(settings.max_concurrent_hosts)
+    queue: asyncio.Queue[MCPCrawlResult | None] = asyncio.Queue()
+
+    buckets: dict[str, list[str]] = defaultdict(list)
+    for url in urls:
+        buckets[urlparse(url).netloc].append(url)
+
+    async def crawl_batch(
+        batch_crawler: AsyncWebCrawler,
+        batch_urls: list[str],
+        batch_config: CrawlerRunConfig,
+    ) -> AsyncIterator[RunManyReturn]:
+        # Capture stdout from crawler and redirect to stderr to avoid conflicts
+        # with stdio transport with MCP
+        with redirect_stdout(sys.stderr):
+            pages = await batch_crawler.arun_many(urls=batch_urls, config=batch_config)
+        if not isinstance(pages, AsyncIterator):
+            raise UnexpectedResultTypeError(
+                f"Expected an AsyncIterator instance from arun, got: {type(pages)}"
+            )
+        async for result in pages:
+            yield result
+
+    async def publish(url: str, mcp_result: MCPCrawlResult) -> None:
+        # Only cache successes so transient errors are retried
+        if cache is not None and mcp_result.status == "success":
+            cache[result_cache_key(url)] = mcp_result
+        await queue.put(mcp_result)
+
+    async def crawl_host(netloc: str, host_urls: list[str]) -> None:
+        try:
+            async with semaphore:
+                browser_urls = host_urls
+                if http_crawler is not None:
+                    await rate_limiter.wait(netloc)
+                    browser_urls = []
+                    async for result in crawl_batch(
+                        http_crawler, host_urls, _HTTP_CRAWL_CFG
+                    ):
+                        mcp_result = await handle_crawl_result_async(result)
+                        if needs_browser(result) or mcp_result.status == "error":
+                            browser_urls.append(result.url)
+                        else:
+                            await publish(result.url, mcp_result)
+
+                if browser_urls:
+                    await rate_limiter.wait(netloc)
+                    async for result in crawl_batch(crawler, browser_urls, config):
+                        await publish(
+                            result.url, await handle_crawl_result_async(result)
+                        )
+
+        except Exception as e:
+            # Catch any other unexpected errors during the crawl
+            await queue.put(
+                MCPCrawlResult(
+                    status="error",
+                    error_message=f"An unexpected error occurred during crawl: {str(e)}",
+                    error_code=classify_error(e),
+                )
+            )
+        finally:
+            # Signal that this host is done
+            await queue.put(None)
+
+    tasks = [
+        asyncio.create_task(crawl_host(netloc, host_urls))
+        for netloc, host_urls in buckets.items()
+    ]
+    try:
+        pending = len(tasks)
+        while pending:
+            item = await queue.get()
+            if item is None:
+                pending -= 1
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 # Specify dependencies for deployment and development and pass lifespan to server
-app = FastMCP("crawl4ai-mcp", dependencies=["crawl4ai"])
+app = FastMCP("crawl4ai-mcp", dependencies=["crawl4ai"], lifespan=lifespan)
+
+# Tools are registered with structured_output=False so results are sent once, as JSON
+# text content. Otherwise FastMCP also sends a structuredContent copy of every
+# result, doubling the serialized size of content-heavy responses.
 
 
-@app.tool()
-async def google_search(query: str) -> MCPCrawlResult:
+@app.tool(structured_output=False)
+async def google_search(query: str, ctx: Context) -> MCPCrawlResult:
     """Perform a Google search and return a markdown page of the top 10 results.
 
     Args:
@@ -62,57 +461,63 @@ async def google_search(query: str) -> MCPCrawlResult:
     Returns:
         MCPCrawlResult: The result of the search, containing the status and content.
     """
-    crawl_config = CrawlerRunConfig(
-        stream=True,
-        cache_mode=CacheMode(settings.cache_mode),
-        keep_attrs=["id", "class"],
-        keep_data_attributes=True,
-        delay_before_return_html=2,
-        word_count_threshold=settings.word_count_threshold,
-        # Stealth mode settings
-        user_agent_mode="random",
-        simulate_user=True,
-        timezone_id="America/Los_Angeles",  # JS Date()/Intl timezone
-        geolocation=GeolocationConfig(  # override GPS coords
-            latitude=34.0522,
-            longitude=-118.2437,
-            accuracy=10.0,
-        ),
-    )
+    # Plain alphanumeric queries only need their spaces encoded, so skip quote()
+    if query.isascii() and query.replace(" ", "").isalnum():
+        encoded_query = query.replace(" ", "+")
+    else:
+        encoded_query = quote(query)
+    crawler = get_crawler(ctx)
     try:
-        async with AsyncWebCrawler(config=settings.browser_config) as crawler:
-            # Capture stdout from crawler and redirect to stderr to avoid
-            # conflicts with stdio transport with MCP
-            with redirect_stdout(
-                io.TextIOWrapper(sys.stderr.buffer, encoding=sys.stderr.encoding)
-            ):
-                result = await crawler.arun(
-                    f"https://www.google.com/search?q={quote(query)}&start=0&num=10",
-                    config=crawl_config,
-                )
-            return handle_crawl_result(result)
+        # Capture stdout from crawler and redirect to stderr to avoid
+        # conflicts with stdio transport with MCP
+        with redirect_stdout(sys.stderr):
+            result = await crawler.arun(
+                f"{_GOOGLE_SEARCH_URL}{encoded_query}&start=0&num=10",
+                config=_GOOGLE_CFG,
+            )
+        return handle_crawl_result(result)
     except Exception as e:
         # Catch any exceptions that occur during the search
         return MCPCrawlResult(
             status="error",
             error_message=f"An error occurred during Google search: {str(e)}",
+            error_code=classify_error(e),
         )
 
 
-@app.tool()
+@app.tool(structured_output=False)
 async def deep_crawl(
-    url: str, keywords: list[str] | None = None
+    url: str,
+    ctx: Context,
+    keywords: list[str] | None = None,
+    priority_patterns: dict[str, int] | None = None,
 ) -> list[MCPCrawlResult]:
-    """Crawl a website deeply, optionally using keywords to prioritize pages.
+    """Crawl a website deeply, optionally prioritizing pages by keywords or URL patterns.
 
     Args:
         url: The URL to start crawling from.
-        keywords: List of keywords to prioritize pages. If None, uses a breadth-first
-            search strategy.
+        keywords: List of keywords to prioritize pages.
+        priority_patterns: Mapping of URL regex patterns to priorities, e.g.
+            {"/docs/": 3, "/blog/": 1}. Pages matching higher priority patterns are
+            crawled first. If neither keywords nor priority_patterns are given, uses a
+            breadth-first search strategy.
     """
-    if keywords:
+    if keywords or priority_patterns:
         # Create a scorer
-        scorer = KeywordRelevanceScorer(keywords=keywords, weight=0.7)
+        try:
+            scorer: KeywordRelevanceScorer = (
+                RegexPriorityScorer(priority_patterns, keywords=keywords, weight=0.7)
+                if priority_patterns
+                else KeywordRelevanceScorer(keywords=keywords, weight=0.7)
+            )
+        except re.error as e:
+            return [
+                MCPCrawlResult(
+                    status="error",
+                    error_message=f"Invalid priority pattern: {str(e)}",
+                    error_code="invalid_input",
+                )
+            ]
 
         # Configure the strategy
         strategy = BestFirstCrawlingStrategy(
@@ -127,119 +532,42 @@ async def deep_crawl(
             max_pages=settings.max_pages,
             include_external=settings.include_external,
         )
-    crawl_config = CrawlerRunConfig(
-        deep_crawl_strategy=strategy,
-        stream=True,  # Handle results as they come in
-        cache_mode=CacheMode(settings.cache_mode),
-        word_count_threshold=settings.word_count_threshold,  # Only return content with at least 10 words
-        # Stealth mode settings
-        user_agent_mode="random",
-        simulate_user=True,
-        timezone_id="America/Los_Angeles",  # JS Date()/Intl timezone
-        geolocation=GeolocationConfig(  # override GPS coords
-            latitude=34.0522,
-            longitude=-118.2437,
-            accuracy=10.0,
-        ),
-    )
+    crawl_config = copy.copy(_DEEP_BASE_CFG)
+    crawl_config.deep_crawl_strategy = strategy
 
-    results = []
-
-    # Explicit lifecycle management for the crawler is recommended for long-running tasks
-    crawler = AsyncWebCrawler(config=settings.browser_config)
-    try:
-        # Capture stdout from crawler and redirect to stderr to avoid conflicts
-        # with stdio transport with MCP
-        with redirect_stdout(
-            io.TextIOWrapper(sys.stderr.buffer, encoding=sys.stderr.encoding)
-        ):
-            pages = await crawler.arun(url, config=crawl_config)
-        if not isinstance(pages, AsyncIterator):
-            return [
-                MCPCrawlResult(
-                    status="error",
-                    error_message=(
-                        f"Expected an AsyncIterator instance from arun, got: {type(pages)}"
-                    ),
-                )
-            ]
-        async for page_result in pages:
-            result = handle_crawl_result(page_result)
-            results.append(result)
-    except Exception as e:
-        # Handle any exceptions that occur during crawling
-        results.append(
-            MCPCrawlResult(
-                status="error",
-                error_message=f"An error occurred during deep crawl: {str(e)}",
-            )
-        )
-    finally:
-        await crawler.close()
+    results: list[MCPCrawlResult] = []
+    async for result in stream_deep_crawl(get_crawler(ctx), url, crawl_config):
+        results.append(result)
+        await ctx.report_progress(len(results), settings.max_pages)
     return results
 
 
-@app.tool()
-async def crawl(urls: list[str]) -> list[MCPCrawlResult]:
+@app.tool(structured_output=False)
+async def crawl(urls: list[str], ctx: Context) -> list[MCPCrawlResult]:
     """Crawl multiple URLs and return their content.
 
+    URLs are grouped by host and each group is crawled as its own batch, so slow
+    hosts do not hold up fast ones and each host sees a polite request cadence.
+
     Args:
         urls: List of URLs to crawl.
 
     Returns:
         List of crawl results for each URL.
     """
-
-    run_cfg = CrawlerRunConfig(
-        cache_mode=CacheMode(settings.cache_mode),
-        word_count_threshold=settings.word_count_threshold,  # Only return content with at least 10 words
-        exclude_external_links=False,
-        exclude_social_media_links=True,
-        stream=True,
-        # Content handling
-        process_iframes=True,
-        remove_overlay_elements=True,
-        magic=True,
-        # Stealth mode settings
-        user_agent_mode="random",
-        simulate_user=True,
-        timezone_id="America/Los_Angeles",  # JS Date()/Intl timezone
-        geolocation=GeolocationConfig(  # override GPS coords
-            latitude=34.0522,
-            longitude=-118.2437,
-            accuracy=10.0,
-        ),
-    )
-
+    # Bypass mode asks for fresh content, so skip the result cache entirely
+    cache = get_result_cache(ctx) if settings.cache_mode != "bypass" else None
     results: list[MCPCrawlResult] = []
-    try:
-        async with AsyncWebCrawler(config=settings.browser_config) as crawler:
-            # Capture stdout from crawler and redirect to stderr to avoid conflicts
-            # with stdio transport with MCP
-            with redirect_stdout(
-                io.TextIOWrapper(sys.stderr.buffer, encoding=sys.stderr.encoding)
-            ):
-                pages = await crawler.arun_many(urls=urls, config=run_cfg)
-            if not isinstance(pages, AsyncIterator):
-                return [
-                    MCPCrawlResult(
-                        status="error",
-                        error_message=(
-                            f"Expected an AsyncIterator instance from arun, got: {type(pages)}"
-                        ),
-                    )
-                ]
-            async for result in pages:
-                results.append(handle_crawl_result(result))
-
-    except Exception as e:
-        # Catch any other unexpected errors during the crawl
-        results.append(
-            MCPCrawlResult(
-                status="error",
-                error_message=f"An unexpected error occurred during crawl: {str(e)}",
-            )
-        )
+    async for result in stream_crawl(
+        get_crawler(ctx),
+        get_rate_limiter(ctx),
+        urls,
+        _CRAWL_CFG,
+        cache=cache,
+        http_crawler=get_http_crawler(ctx),
+    ):
+        results.append(result)
+        await ctx.report_progress(len(results), len(urls))
     return results
 
 
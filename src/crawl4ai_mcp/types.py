@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 BrowserType = Literal["chromium", "firefox", "webkit"]
 
@@ -14,12 +14,24 @@ CacheModeType = Literal[
 
 StatusType = Literal["success", "error"]
 
-TransportType = Literal["stdio", "html"]
+ErrorCodeType = Literal[
+    "network",
+    "timeout",
+    "browser",
+    "invalid_input",
+    "invalid_result_type",
+    "no_content",
+    "unknown",
+]
+
+TransportType = Literal["stdio", "http"]
 
 
 class MCPCrawlResult(BaseModel):
     """Model for crawl results"""
 
+    model_config = ConfigDict(frozen=True)
+
     status: StatusType = Field(
         default="success",
         description="The status of the crawl operation, e.g., 'success' or 'error'.",
@@ -29,3 +41,10 @@ class MCPCrawlResult(BaseModel):
         default=None, description="The extracted content in html or markdown format."
     )
     error_message: str | None = Field(default=None, description="Error message if any.")
+    error_code: ErrorCodeType | None = Field(
+        default=None,
+        description=(
+            "Category of the error if any, e.g. 'network' or 'timeout', to decide "
+            "whether to retry."
+        ),
+    )
@@ -0,0 +1,65 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from crawl4ai_mcp.main import install_uvloop, main
+
+
+class TestInstallUvloop:
+    """Unit tests for the install_uvloop function in main.py."""
+
+    def test_installs_uvloop_policy_when_available(self):
+        mock_uvloop = MagicMock()
+        with (
+            patch.dict(sys.modules, {"uvloop": mock_uvloop}),
+            patch("crawl4ai_mcp.main.sys.version_info", (3, 13)),
+            patch("crawl4ai_mcp.main.asyncio.set_event_loop_policy") as mock_set,
+        ):
+            install_uvloop()
+        mock_set.assert_called_once_with(mock_uvloop.EventLoopPolicy.return_value)
+
+    def test_skips_on_python_without_event_loop_policies(self):
+        with (
+            patch.dict(sys.modules, {"uvloop": MagicMock()}),
+            patch("crawl4ai_mcp.main.sys.version_info", (3, 14)),
+            patch("crawl4ai_mcp.main.asyncio.set_event_loop_policy") as mock_set,
+        ):
+            install_uvloop()
+        mock_set.assert_not_called()
+
+    def test_skips_when_uvloop_missing(self):
+        with (
+            patch.dict(sys.modules, {"uvloop": None}),
+            patch("crawl4ai_mcp.main.asyncio.set_event_loop_policy") as mock_set,
+        ):
+            install_uvloop()
+        mock_set.assert_not_called()
+
+
+class TestMain:
+    """Unit tests for the main CLI entry point in main.py."""
+
+    @pytest.mark.parametrize(
+        "args, expected_transport",
+        [
+            ([], "stdio"),
+            (["--transport", "stdio"], "stdio"),
+            (["--transport", "http"], "streamable-http"),
+        ],
+    )
+    def test_runs_app_with_transport(self, args, expected_transport):
+        with (
+            patch("crawl4ai_mcp.server.app.run") as mock_run,
+            patch("crawl4ai_mcp.main.install_uvloop"),
+        ):
+            result = CliRunner().invoke(main, args)
+        assert result.exit_code == 0
+        mock_run.assert_called_once_with(transport=expected_transport)
+
+    def test_rejects_unknown_transport(self):
+        with patch("crawl4ai_mcp.server.app.run") as mock_run:
+            result = CliRunner().invoke(main, ["--transport", "html"])
+        assert result.exit_code != 0
+        mock_run.assert_not_called()
@@ -1,8 +1,10 @@
-import io
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 from urllib.parse import quote
 
+import aiohttp
 import pytest
+from cachetools import TTLCache
 from crawl4ai import (
     AsyncWebCrawler,
     BestFirstCrawlingStrategy,
@@ -10,15 +12,32 @@ from crawl4ai import (
     CrawlerRunConfig,
     CrawlResult,
 )
+from crawl4ai.config import PAGE_TIMEOUT
+from crawl4ai.deep_crawling.base_strategy import DeepCrawlDecorator
 from crawl4ai.models import CrawlResultContainer
+from mcp.server.fastmcp import Context
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from pydantic import ValidationError
 
 # Import the actual module components to test
 from crawl4ai_mcp.config import Settings, settings
+from crawl4ai_mcp.scorers import RegexPriorityScorer
 from crawl4ai_mcp.server import (
+    _DEEP_BASE_CFG,
+    DomainRateLimiter,
+    UnexpectedResultTypeError,
+    app,
+    classify_error,
+    classify_error_message,
     crawl,
     deep_crawl,
     google_search,
     handle_crawl_result,
+    handle_crawl_result_async,
+    lifespan,
+    needs_browser,
+    stream_deep_crawl,
 )
 from crawl4ai_mcp.types import MCPCrawlResult
 
@@ -61,6 +80,8 @@ class TestSettings:
         assert s.max_pages == 50
         assert s.include_external is False
         assert s.content_type == "markdown"
+        # Longer than crawl4ai's own page timeout, so slow pages fail on their own
+        assert s.page_timeout > PAGE_TIMEOUT / 1000
 
     def test_browser_config_property(self):
         s = Settings(browser_type="firefox", headless=False, verbose=True)
@@ -70,6 +91,10 @@ class TestSettings:
         assert browser_cfg.headless is False
         assert browser_cfg.verbose is True
 
+    def test_browser_config_is_cached(self):
+        s = Settings()
+        assert s.browser_config is s.browser_config
+
 
 class TestMCPCrawlResult:
     """Unit tests for the MCPCrawlResult model in types.py."""
@@ -92,6 +117,11 @@ class TestMCPCrawlResult:
         assert result.content is None
         assert result.error_message == "Failed to crawl"
 
+    def test_mcpcrawlresult_is_immutable(self):
+        result = MCPCrawlResult(status="success", url="http://example.com")
+        with pytest.raises(ValidationError):
+            result.content = "Changed"
+
 
 class TestHandleCrawlResult:
     """Unit tests for the handle_crawl_result function in server.py."""
@@ -135,6 +165,7 @@ class TestHandleCrawlResult:
         )
         mcp_result = handle_crawl_result(mock_crawl_res)
         assert mcp_result.status == "error"
+        assert mcp_result.error_code == "unknown"
         assert mcp_result.url is None
         assert mcp_result.content is None
         assert mcp_result.error_message == "Page not found"
@@ -143,10 +174,23 @@ class TestHandleCrawlResult:
         mock_crawl_res = create_mock_crawl_result(success=False, url="http://test.com")
         mcp_result = handle_crawl_result(mock_crawl_res)
         assert mcp_result.status == "error"
+        assert mcp_result.error_code == "unknown"
         assert mcp_result.url is None
         assert mcp_result.content is None
         assert mcp_result.error_message == "Unknown crawl error."
 
+    def test_success_without_content(self):
+        mock_crawl_res = create_mock_crawl_result(success=True, url="http://test.com")
+        with patch.object(settings, "content_type", "markdown"):
+            mcp_result = handle_crawl_result(mock_crawl_res)
+            assert mcp_result.status == "error"
+            assert mcp_result.error_code == "no_content"
+            assert mcp_result.content is None
+            assert (
+                mcp_result.error_message
+                == "The crawler failed to extract any valid content."
+            )
+
     def test_crawlresultcontainer_success_markdown(self):
         mock_crawl_res = create_mock_crawl_result(
             success=True,
@@ -163,24 +207,141 @@ class TestHandleCrawlResult:
     def test_unexpected_result_type(self):
         mcp_result = handle_crawl_result("unexpected string")
         assert mcp_result.status == "error"
+        assert mcp_result.error_code == "invalid_result_type"
         assert (
             mcp_result.error_message
             == "Unexpected result type from crawler: <class 'str'>"
         )
 
 
-# Fixtures for patching AsyncWebCrawler and redirect_stdout for integration tests
+class TestClassifyError:
+    """Unit tests for the error classification functions in server.py."""
+
+    @pytest.mark.parametrize(
+        "error, expected_code",
+        [
+            (TimeoutError(), "timeout"),
+            (PlaywrightTimeoutError("Timeout 30000ms exceeded"), "timeout"),
+            (aiohttp.ServerTimeoutError(), "timeout"),
+            (aiohttp.ClientConnectionError(), "network"),
+            (ConnectionResetError(), "network"),
+            (PlaywrightError("Target page has been closed"), "browser"),
+            (UnexpectedResultTypeError("bad type"), "invalid_result_type"),
+            (RuntimeError("Page.goto: net::ERR_NAME_NOT_RESOLVED"), "network"),
+            (Exception("Something went wrong"), "unknown"),
+        ],
+    )
+    def test_classify_error(self, error, expected_code):
+        assert classify_error(error) == expected_code
+
+    @pytest.mark.parametrize(
+        "message, expected_code",
+        [
+            ("Page.goto: Timeout 60000ms exceeded", "timeout"),
+            ("net::ERR_CONNECTION_REFUSED at http://a.com", "network"),
+            ("Page not found", "unknown"),
+            (None, "unknown"),
+        ],
+    )
+    def test_classify_error_message(self, message, expected_code):
+        assert classify_error_message(message) == expected_code
+
+    def test_failed_crawlresult_is_classified(self):
+        mock_crawl_res = create_mock_crawl_result(
+            success=False,
+            url="http://test.com",
+            error_message="Failed on navigating ACS-GOTO:\nPage.goto: Timeout 60000ms exceeded",
+        )
+        assert handle_crawl_result(mock_crawl_res).error_code == "timeout"
+
+
+class TestRegexPriorityScorer:
+    """Unit tests for the RegexPriorityScorer class in scorers.py."""
+
+    def test_highest_matching_priority_wins(self):
+        scorer = RegexPriorityScorer({r"/docs/": 3, r"/docs/api/": 1, r"/blog/": 2})
+        assert scorer.score("http://site.com/docs/api/index") == 1.0
+        assert scorer.score("http://site.com/blog/post") == pytest.approx(2 / 3)
+        assert scorer.score("http://site.com/about") == 0.0
+
+    def test_patterns_are_case_insensitive_by_default(self):
+        scorer = RegexPriorityScorer({r"/docs/": 1})
+        assert scorer.score("http://site.com/DOCS/intro") == 1.0
+
+    def test_combined_with_keywords(self):
+        scorer = RegexPriorityScorer({r"/docs/": 2}, keywords=["install"])
+        assert scorer.score("http://site.com/docs/install") == 1.0
+        assert scorer.score("http://site.com/docs/intro") == 0.5
+        assert scorer.score("http://site.com/install") == 0.5
+        assert scorer.score("http://site.com/about") == 0.0
+
+    def test_weight_is_applied(self):
+        scorer = RegexPriorityScorer({r"/docs/": 1}, weight=0.5)
+        assert scorer.score("http://site.com/docs/") == 0.5
+
+
+class TestHandleCrawlResultAsync:
+    """Unit tests for the handle_crawl_result_async function in server.py."""
+
+    @pytest.mark.asyncio
+    async def test_small_page_handled_inline(self):
+        mock_crawl_res = create_mock_crawl_result(
+            success=True,
+            url="http://test.com",
+            html="<p>small</p>",
+            markdown_fit="Small",
+        )
+        with patch("crawl4ai_mcp.server.asyncio.to_thread") as mock_to_thread:
+            mcp_result = await handle_crawl_result_async(mock_crawl_res)
+            mock_to_thread.assert_not_called()
+        assert mcp_result.content == "Small"
+
+    @pytest.mark.asyncio
+    async def test_large_page_handled_in_thread(self):
+        mock_crawl_res = create_mock_crawl_result(
+            success=True,
+            url="http://test.com",
+            html="<p>" + "x" * 100_000 + "</p>",
+            markdown_fit="Large",
+        )
+        with patch(
+            "crawl4ai_mcp.server.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as mock_to_thread:
+            mcp_result = await handle_crawl_result_async(mock_crawl_res)
+            mock_to_thread.assert_called_once_with(handle_crawl_result, mock_crawl_res)
+        assert mcp_result.status == "success"
+        assert mcp_result.content == "Large"
+
+    @pytest.mark.asyncio
+    async def test_unexpected_result_type(self):
+        mcp_result = await handle_crawl_result_async("unexpected string")
+        assert mcp_result.status == "error"
+        assert mcp_result.error_code == "invalid_result_type"
+
+
+# Fixtures for mocking the shared crawler and redirect_stdout for integration tests
 @pytest.fixture
 def mock_async_web_crawler_instance():
     """
-    Patches AsyncWebCrawler to return a mock instance
-    for its async context manager methods.
+    Returns a mock AsyncWebCrawler instance standing in for the lifespan crawler.
     """
-    mock_instance = AsyncMock(spec=AsyncWebCrawler)
-    mock_instance.__aenter__.return_value = mock_instance
-    mock_instance.__aexit__.return_value = None
-    with patch("crawl4ai_mcp.server.AsyncWebCrawler", return_value=mock_instance):
-        yield mock_instance
+    return AsyncMock(spec=AsyncWebCrawler)
+
+
+@pytest.fixture
+def mock_ctx(mock_async_web_crawler_instance):
+    """
+    Returns a mock MCP Context whose lifespan context holds the mock crawler,
+    a rate limiter with no delay and an empty result cache.
+    """
+    ctx = MagicMock(spec=Context)
+    ctx.request_context.lifespan_context = {
+        "crawler": mock_async_web_crawler_instance,
+        "http_crawler": None,
+        "rate_limiter": DomainRateLimiter(0.0),
+        "result_cache": TTLCache(maxsize=16, ttl=60),
+    }
+    return ctx
 
 
 @pytest.fixture(autouse=True)
@@ -192,22 +353,120 @@ def mock_redirect_stdout():
         yield
 
 
-@pytest.fixture(autouse=True)
-def mock_text_io():
-    """
-    Patches io.TextIOWrapper to return a mock instance
-    """
+class TestDomainRateLimiter:
+    """Unit tests for the DomainRateLimiter class in server.py."""
+
+    @pytest.mark.asyncio
+    async def test_first_request_does_not_wait(self):
+        limiter = DomainRateLimiter(5.0)
+        with patch("crawl4ai_mcp.server.asyncio.sleep") as mock_sleep:
+            await limiter.wait("example.com")
+            mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_to_same_host_waits(self):
+        limiter = DomainRateLimiter(5.0)
+        with patch("crawl4ai_mcp.server.asyncio.sleep") as mock_sleep:
+            await limiter.wait("example.com")
+            await limiter.wait("other.com")
+            mock_sleep.assert_not_called()
+            await limiter.wait("example.com")
+            mock_sleep.assert_called_once()
+            assert 0 < mock_sleep.call_args[0][0] <= 5.0
 
-    mock_instance = MagicMock(spec=io.TextIOWrapper)
-    with patch("crawl4ai_mcp.server.io.TextIOWrapper", return_value=mock_instance):
-        yield mock_instance
+    @pytest.mark.asyncio
+    async def test_hosts_are_forgotten_after_their_delay(self):
+        limiter = DomainRateLimiter(5.0)
+        with patch("crawl4ai_mcp.server.time") as mock_time:
+            mock_monotonic = mock_time.monotonic
+            mock_monotonic.return_value = 100.0
+            await limiter.wait("example.com")
+            assert "example.com" in limiter._last_hit
+
+            mock_monotonic.return_value = 103.0
+            await limiter.wait("other.com")
+            assert "example.com" in limiter._last_hit
+
+            mock_monotonic.return_value = 105.0
+            await limiter.wait("third.com")
+            assert "example.com" not in limiter._last_hit
+            assert set(limiter._last_hit) == {"other.com", "third.com"}
+
+
+class TestLifespan:
+    """Unit tests for the crawler lifecycle managed by the server lifespan."""
+
+    @pytest.mark.asyncio
+    async def test_lifespan_starts_and_closes_crawler(self):
+        mock_instance = AsyncMock(spec=AsyncWebCrawler)
+        with patch(
+            "crawl4ai_mcp.server.AsyncWebCrawler", return_value=mock_instance
+        ) as mock_cls:
+            async with lifespan(app) as context:
+                assert context["crawler"] is mock_instance
+                assert isinstance(context["rate_limiter"], DomainRateLimiter)
+                assert isinstance(context["result_cache"], TTLCache)
+                mock_instance.start.assert_called_once()
+                mock_instance.close.assert_not_called()
+            mock_cls.assert_called_once_with(config=settings.browser_config)
+            mock_instance.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_lifespan_starts_http_crawler_for_fast_path(self):
+        mock_browser = AsyncMock(spec=AsyncWebCrawler)
+        mock_http = AsyncMock(spec=AsyncWebCrawler)
+        with (
+            patch.object(settings, "http_fast_path", True),
+            patch(
+                "crawl4ai_mcp.server.AsyncWebCrawler",
+                side_effect=[mock_browser, mock_http],
+            ),
+        ):
+            async with lifespan(app) as context:
+                assert context["crawler"] is mock_browser
+                assert context["http_crawler"] is mock_http
+                mock_http.start.assert_called_once()
+            mock_browser.close.assert_called_once()
+            mock_http.close.assert_called_once()
+
+
+class TestNeedsBrowser:
+    """Unit tests for the needs_browser heuristic in server.py."""
+
+    def test_static_page(self):
+        html = "<html><body>" + "<p>Static content</p>" * 100 + "</body></html>"
+        result = create_mock_crawl_result(success=True, url="http://a.com", html=html)
+        assert needs_browser(result) is False
+
+    def test_failed_fetch(self):
+        result = create_mock_crawl_result(success=False, url="http://a.com")
+        assert needs_browser(result) is True
+
+    def test_small_page(self):
+        result = create_mock_crawl_result(
+            success=True, url="http://a.com", html="<html></html>"
+        )
+        assert needs_browser(result) is True
+
+    def test_javascript_app_shell(self):
+        html = '<html><body><div id="root"></div>' + " " * 2048 + "</body></html>"
+        result = create_mock_crawl_result(success=True, url="http://a.com", html=html)
+        assert needs_browser(result) is True
 
 
 class TestServerTools:
     """Integration tests for the tool functions in server.py, mocking AsyncWebCrawler."""
 
     @pytest.mark.asyncio
-    async def test_google_search_success(self, mock_async_web_crawler_instance):
+    async def test_tools_return_unstructured_output(self):
+        tools = await app.list_tools()
+        assert {tool.name for tool in tools} == {"google_search", "deep_crawl", "crawl"}
+        assert all(tool.outputSchema is None for tool in tools)
+
+    @pytest.mark.asyncio
+    async def test_google_search_success(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
         mock_arun = AsyncMock()
         mock_async_web_crawler_instance.arun = mock_arun
 
@@ -218,16 +477,13 @@ class TestServerTools:
         )
 
         with patch.object(settings, "content_type", "markdown"):
-            result = await google_search("test query")
+            result = await google_search("test query", mock_ctx)
 
             assert result.status == "success"
             assert result.url == "http://google.com/search?q=test"
             assert result.content == "Google search results"
             mock_arun.assert_called_once()
-            assert (
-                f"google.com/search?q={quote('test query')}"
-                in mock_arun.call_args[0][0]
-            )
+            assert "google.com/search?q=test+query&" in mock_arun.call_args[0][0]
 
             passed_config = mock_arun.call_args[1]["config"]
             assert isinstance(passed_config, CrawlerRunConfig)
@@ -235,21 +491,42 @@ class TestServerTools:
             assert passed_config.cache_mode.value == settings.cache_mode
 
     @pytest.mark.asyncio
-    async def test_google_search_exception(self, mock_async_web_crawler_instance):
+    async def test_google_search_quotes_special_characters(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_arun = AsyncMock()
+        mock_async_web_crawler_instance.arun = mock_arun
+        mock_arun.return_value = create_mock_crawl_result(
+            success=True, url="http://google.com/search", markdown_fit="Results"
+        )
+
+        await google_search("c++ vs rust?", mock_ctx)
+
+        assert (
+            f"google.com/search?q={quote('c++ vs rust?')}&" in mock_arun.call_args[0][0]
+        )
+
+    @pytest.mark.asyncio
+    async def test_google_search_exception(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
         mock_arun = AsyncMock()
         mock_async_web_crawler_instance.arun = mock_arun
         mock_arun.side_effect = Exception("Network error")
 
-        result = await google_search("error query")
+        result = await google_search("error query", mock_ctx)
 
         assert result.status == "error"
+        assert result.error_code == "unknown"
         assert (
             "An error occurred during Google search: Network error"
             in result.error_message
         )
 
     @pytest.mark.asyncio
-    async def test_deep_crawl_keywords_success(self, mock_async_web_crawler_instance):
+    async def test_deep_crawl_keywords_success(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
         mock_arun = AsyncMock()
         mock_async_web_crawler_instance.arun = mock_arun
 
@@ -265,7 +542,7 @@ class TestServerTools:
 
         with patch.object(settings, "content_type", "markdown"):
             results = await deep_crawl(
-                "http://testsite.com", keywords=["keyword1", "keyword2"]
+                "http://testsite.com", mock_ctx, keywords=["keyword1", "keyword2"]
             )
 
             assert len(results) == 2
@@ -275,16 +552,18 @@ class TestServerTools:
             assert results[1].status == "success"
             assert results[1].url == "http://site.com/page2"
             assert results[1].content == "Page 2 content"
+            # Progress is reported as each page arrives
+            assert mock_ctx.report_progress.await_count == 2
 
             call_args, call_kwargs = mock_arun.call_args
             assert isinstance(
                 call_kwargs["config"].deep_crawl_strategy, BestFirstCrawlingStrategy
             )
-            mock_async_web_crawler_instance.close.assert_called_once()
+            mock_async_web_crawler_instance.close.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_deep_crawl_no_keywords_success(
-        self, mock_async_web_crawler_instance
+        self, mock_async_web_crawler_instance, mock_ctx
     ):
         mock_arun = AsyncMock()
         mock_async_web_crawler_instance.arun = mock_arun
@@ -297,7 +576,7 @@ class TestServerTools:
         mock_arun.return_value = async_iter_results()
 
         with patch.object(settings, "content_type", "markdown"):
-            results = await deep_crawl("http://testsite.com")
+            results = await deep_crawl("http://testsite.com", mock_ctx)
 
             assert len(results) == 1
             assert results[0].status == "success"
@@ -308,104 +587,391 @@ class TestServerTools:
             assert isinstance(
                 call_kwargs["config"].deep_crawl_strategy, BFSDeepCrawlStrategy
             )
-            mock_async_web_crawler_instance.close.assert_called_once()
+            # The shared config template is copied, not modified
+            assert call_kwargs["config"] is not _DEEP_BASE_CFG
+            assert _DEEP_BASE_CFG.deep_crawl_strategy is None
+            mock_async_web_crawler_instance.close.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_deep_crawl_arun_not_async_iterator(
+    async def test_deep_crawl_priority_patterns(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_arun = AsyncMock()
+        mock_async_web_crawler_instance.arun = mock_arun
+
+        async def async_iter_results():
+            yield create_mock_crawl_result(
+                success=True, url="http://site.com/docs", markdown_fit="Docs content"
+            )
+
+        mock_arun.return_value = async_iter_results()
+
+        results = await deep_crawl(
+            "http://testsite.com", mock_ctx, priority_patterns={"/docs/": 2}
+        )
+
+        assert len(results) == 1
+        assert results[0].status == "success"
+        strategy = mock_arun.call_args[1]["config"].deep_crawl_strategy
+        assert isinstance(strategy, BestFirstCrawlingStrategy)
+        assert isinstance(strategy.url_scorer, RegexPriorityScorer)
+
+    @pytest.mark.asyncio
+    async def test_deep_crawl_invalid_priority_pattern(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        results = await deep_crawl(
+            "http://testsite.com", mock_ctx, priority_patterns={"(": 1}
+        )
+
+        assert len(results) == 1
+        assert results[0].status == "error"
+        assert results[0].error_code == "invalid_input"
+        assert "Invalid priority pattern" in results[0].error_message
+        mock_async_web_crawler_instance.arun.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_deep_crawl_page_timeout(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_arun = AsyncMock()
+        mock_async_web_crawler_instance.arun = mock_arun
+
+        async def async_iter_results():
+            yield create_mock_crawl_result(
+                success=True, url="http://site.com/page1", markdown_fit="Page 1 content"
+            )
+            # Simulate a page that never finishes loading
+            await asyncio.Event().wait()
+
+        mock_arun.return_value = async_iter_results()
+
+        with patch.object(settings, "page_timeout", 0.01):
+            results = await deep_crawl("http://testsite.com", mock_ctx)
+
+        assert len(results) == 2
+        assert results[0].status == "success"
+        assert results[0].content == "Page 1 content"
+        assert results[1].status == "error"
+        assert results[1].error_code == "timeout"
+        assert "Timed out after 0.01s" in results[1].error_message
+
+    @staticmethod
+    def deep_crawl_through_decorator(crawler, pages):
+        """Route crawler.arun through crawl4ai's deep crawl decorator like the real
+        crawler does, with a strategy that streams the given pages."""
+        strategy = MagicMock()
+        strategy.arun = AsyncMock(return_value=pages)
+        crawler.arun = DeepCrawlDecorator(crawler)(AsyncMock())
+        return MagicMock(
+            spec=CrawlerRunConfig, deep_crawl_strategy=strategy, stream=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_stream_deep_crawl_through_decorator(
+        self, mock_async_web_crawler_instance
+    ):
+        async def pages():
+            for i in range(2):
+                yield create_mock_crawl_result(
+                    success=True, url=f"http://site.com/{i}", markdown_fit="Content"
+                )
+
+        config = self.deep_crawl_through_decorator(
+            mock_async_web_crawler_instance, pages()
+        )
+        results = [
+            result
+            async for result in stream_deep_crawl(
+                mock_async_web_crawler_instance, "http://site.com", config
+            )
+        ]
+
+        assert [r.status for r in results] == ["success", "success"]
+        assert DeepCrawlDecorator.deep_crawl_active.get() is False
+
+    @pytest.mark.asyncio
+    async def test_stream_deep_crawl_through_decorator_page_timeout(
         self, mock_async_web_crawler_instance
+    ):
+        async def pages():
+            yield create_mock_crawl_result(
+                success=True, url="http://site.com/0", markdown_fit="Content"
+            )
+            await asyncio.Event().wait()
+
+        config = self.deep_crawl_through_decorator(
+            mock_async_web_crawler_instance, pages()
+        )
+        with patch.object(settings, "page_timeout", 0.01):
+            results = [
+                result
+                async for result in stream_deep_crawl(
+                    mock_async_web_crawler_instance, "http://site.com", config
+                )
+            ]
+
+        assert [r.status for r in results] == ["success", "error"]
+        assert results[1].error_code == "timeout"
+        assert "Timed out after 0.01s" in results[1].error_message
+        assert DeepCrawlDecorator.deep_crawl_active.get() is False
+
+    @pytest.mark.asyncio
+    async def test_deep_crawl_setup_timeout(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_async_web_crawler_instance.arun = AsyncMock(
+            side_effect=TimeoutError("Browser did not start")
+        )
+
+        results = await deep_crawl("http://testsite.com", mock_ctx)
+
+        assert len(results) == 1
+        assert results[0].error_code == "timeout"
+        assert (
+            "An error occurred during deep crawl: Browser did not start"
+            in results[0].error_message
+        )
+
+    @pytest.mark.asyncio
+    async def test_deep_crawl_error_mid_stream(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_arun = AsyncMock()
+        mock_async_web_crawler_instance.arun = mock_arun
+
+        async def async_iter_results():
+            yield create_mock_crawl_result(
+                success=True, url="http://site.com/page1", markdown_fit="Page 1 content"
+            )
+            raise Exception("Browser crashed")
+
+        mock_arun.return_value = async_iter_results()
+
+        results = await deep_crawl("http://testsite.com", mock_ctx)
+
+        assert len(results) == 2
+        assert results[0].status == "success"
+        assert results[1].status == "error"
+        assert results[1].error_code == "unknown"
+        assert (
+            "An error occurred during deep crawl: Browser crashed"
+            in results[1].error_message
+        )
+
+    @pytest.mark.asyncio
+    async def test_deep_crawl_arun_not_async_iterator(
+        self, mock_async_web_crawler_instance, mock_ctx
     ):
         mock_arun = AsyncMock()
         mock_async_web_crawler_instance.arun = mock_arun
         mock_arun.return_value = "not an async iterator"
 
-        results = await deep_crawl("http://testsite.com")
+        results = await deep_crawl("http://testsite.com", mock_ctx)
 
         assert len(results) == 1
         assert results[0].status == "error"
+        assert results[0].error_code == "invalid_result_type"
         assert (
             "Expected an AsyncIterator instance from arun, got: <class 'str'>"
             in results[0].error_message
         )
-        mock_async_web_crawler_instance.close.assert_called_once()
+        mock_async_web_crawler_instance.close.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_deep_crawl_exception(self, mock_async_web_crawler_instance):
+    async def test_deep_crawl_exception(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
         mock_arun = AsyncMock()
         mock_async_web_crawler_instance.arun = mock_arun
         mock_arun.side_effect = Exception("Deep crawl error")
 
-        results = await deep_crawl("http://error.com")
+        results = await deep_crawl("http://error.com", mock_ctx)
 
         assert len(results) == 1
         assert results[0].status == "error"
+        assert results[0].error_code == "unknown"
         assert (
             "An error occurred during deep crawl: Deep crawl error"
             in results[0].error_message
         )
-        mock_async_web_crawler_instance.close.assert_called_once()
+        mock_async_web_crawler_instance.close.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_crawl_multiple_urls_success(self, mock_async_web_crawler_instance):
+    async def test_crawl_multiple_urls_success(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
         mock_arun_many = AsyncMock()
         mock_async_web_crawler_instance.arun_many = mock_arun_many
 
-        async def async_iter_results():
-            yield create_mock_crawl_result(
-                success=True, url="http://url1.com", markdown_fit="Content 1"
-            )
-            yield create_mock_crawl_result(
-                success=True, url="http://url2.com", markdown_fit="Content 2"
-            )
+        async def async_iter_results(urls, config):
+            for url in urls:
+                yield create_mock_crawl_result(
+                    success=True, url=url, markdown_fit=f"Content of {url}"
+                )
 
-        mock_arun_many.return_value = async_iter_results()
+        mock_arun_many.side_effect = async_iter_results
         with patch.object(settings, "content_type", "markdown"):
             urls_to_crawl = ["http://url1.com", "http://url2.com"]
-            results = await crawl(urls_to_crawl)
+            results = await crawl(urls_to_crawl, mock_ctx)
 
             assert len(results) == 2
             assert results[0].status == "success"
             assert results[0].url == "http://url1.com"
-            assert results[0].content == "Content 1"
+            assert results[0].content == "Content of http://url1.com"
             assert results[1].status == "success"
             assert results[1].url == "http://url2.com"
-            assert results[1].content == "Content 2"
-            mock_arun_many.assert_called_once()
+            assert results[1].content == "Content of http://url2.com"
+            # One arun_many batch per host
+            assert mock_arun_many.call_count == 2
+            mock_ctx.report_progress.assert_awaited_with(2, 2)
 
             call_args, call_kwargs = mock_arun_many.call_args
-            assert call_kwargs["urls"] == urls_to_crawl
+            assert call_kwargs["urls"] == ["http://url2.com"]
             passed_config = call_kwargs["config"]
             assert isinstance(passed_config, CrawlerRunConfig)
             assert passed_config.stream is True
             assert passed_config.cache_mode.value == settings.cache_mode
             assert passed_config.word_count_threshold == settings.word_count_threshold
 
+    @pytest.mark.asyncio
+    async def test_crawl_batches_urls_by_host(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_arun_many = AsyncMock()
+        mock_async_web_crawler_instance.arun_many = mock_arun_many
+
+        async def async_iter_results(urls, config):
+            for url in urls:
+                yield create_mock_crawl_result(
+                    success=True, url=url, markdown_fit="Content"
+                )
+
+        mock_arun_many.side_effect = async_iter_results
+        urls_to_crawl = [
+            "http://a.com/1",
+            "http://b.com/1",
+            "http://a.com/2",
+        ]
+        results = await crawl(urls_to_crawl, mock_ctx)
+
+        assert len(results) == 3
+        batches = [call.kwargs["urls"] for call in mock_arun_many.call_args_list]
+        assert batches == [["http://a.com/1", "http://a.com/2"], ["http://b.com/1"]]
+
+    @pytest.mark.asyncio
+    async def test_crawl_serves_repeat_urls_from_cache(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_arun_many = AsyncMock()
+        mock_async_web_crawler_instance.arun_many = mock_arun_many
+
+        async def async_iter_results(urls, config):
+            for url in urls:
+                yield create_mock_crawl_result(
+                    success=url != "http://bad.com",
+                    url=url,
+                    markdown_fit=f"Content of {url}",
+                )
+
+        mock_arun_many.side_effect = async_iter_results
+        with patch.object(settings, "cache_mode", "enabled"):
+            await crawl(["http://url1.com", "http://bad.com"], mock_ctx)
+            results = await crawl(["http://url1.com", "http://bad.com"], mock_ctx)
+
+        assert [r.status for r in results] == ["success", "error"]
+        assert results[0].content == "Content of http://url1.com"
+        # Only the failed URL is crawled again
+        assert mock_arun_many.call_count == 3
+        assert mock_arun_many.call_args.kwargs["urls"] == ["http://bad.com"]
+
+    @pytest.mark.asyncio
+    async def test_crawl_bypass_mode_skips_cache(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        mock_arun_many = AsyncMock()
+        mock_async_web_crawler_instance.arun_many = mock_arun_many
+
+        async def async_iter_results(urls, config):
+            for url in urls:
+                yield create_mock_crawl_result(
+                    success=True, url=url, markdown_fit="Content"
+                )
+
+        mock_arun_many.side_effect = async_iter_results
+        with patch.object(settings, "cache_mode", "bypass"):
+            await crawl(["http://url1.com"], mock_ctx)
+            await crawl(["http://url1.com"], mock_ctx)
+
+        assert mock_arun_many.call_count == 2
+        assert len(mock_ctx.request_context.lifespan_context["result_cache"]) == 0
+
+    @pytest.mark.asyncio
+    async def test_crawl_http_fast_path(
+        self, mock_async_web_crawler_instance, mock_ctx
+    ):
+        static_html = "<html><body>" + "<p>Static</p>" * 200 + "</body></html>"
+        mock_http = AsyncMock(spec=AsyncWebCrawler)
+        mock_ctx.request_context.lifespan_context["http_crawler"] = mock_http
+
+        async def http_results(urls, config):
+            for url in urls:
+                yield create_mock_crawl_result(
+                    success=True,
+                    url=url,
+                    html=static_html if url == "http://a.com/static" else "<html/>",
+                    markdown_fit="Content",
+                )
+
+        async def browser_results(urls, config):
+            for url in urls:
+                yield create_mock_crawl_result(
+                    success=True, url=url, markdown_fit="Rendered"
+                )
+
+        mock_http.arun_many = AsyncMock(side_effect=http_results)
+        mock_browser_arun_many = AsyncMock(side_effect=browser_results)
+        mock_async_web_crawler_instance.arun_many = mock_browser_arun_many
+
+        with patch.object(settings, "content_type", "markdown"):
+            results = await crawl(["http://a.com/static", "http://a.com/app"], mock_ctx)
+
+        assert {r.url: r.content for r in results} == {
+            "http://a.com/static": "Content",
+            "http://a.com/app": "Rendered",
+        }
+        mock_browser_arun_many.assert_called_once()
+        assert mock_browser_arun_many.call_args.kwargs["urls"] == ["http://a.com/app"]
+
     @pytest.mark.asyncio
     async def test_crawl_arun_many_not_async_iterator(
-        self, mock_async_web_crawler_instance
+        self, mock_async_web_crawler_instance, mock_ctx
     ):
         mock_arun_many = AsyncMock()
         mock_async_web_crawler_instance.arun_many = mock_arun_many
         mock_arun_many.return_value = "not an async iterator"
 
-        results = await crawl(["http://url.com"])
+        results = await crawl(["http://url.com"], mock_ctx)
 
         assert len(results) == 1
         assert results[0].status == "error"
+        assert results[0].error_code == "invalid_result_type"
         assert (
             "Expected an AsyncIterator instance from arun, got: <class 'str'>"
             in results[0].error_message
         )
 
     @pytest.mark.asyncio
-    async def test_crawl_exception(self, mock_async_web_crawler_instance):
+    async def test_crawl_exception(self, mock_async_web_crawler_instance, mock_ctx):
         mock_arun_many = AsyncMock()
         mock_async_web_crawler_instance.arun_many = mock_arun_many
         mock_arun_many.side_effect = Exception("Crawl many error")
 
-        results = await crawl(["http://error.com"])
+        results = await crawl(["http://error.com"], mock_ctx)
 
         assert len(results) == 1
         assert results[0].status == "error"
+        assert results[0].error_code == "unknown"
         assert (
             "An unexpected error occurred during crawl: Crawl many error"
             in results[0].error_message